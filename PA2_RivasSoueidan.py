@@ -3,6 +3,8 @@ import numpy as np
 import sys
 import random
 import math
+import time
+import json
 
 class GameBoard:
     """Connect4 game board class."""
@@ -15,12 +17,18 @@ class GameBoard:
         if self.board[0, col] != 'O':
             raise ValueError("Column is full")
         
-        for row in range(6):
+        # Row 0 is the top of the board, so pieces settle from row 5 upwards
+        for row in range(5, -1, -1):
             if self.board[row, col] == 'O':
                 self.board[row][col] = 'Y' if player == 'Y' else 'R'
                 return
         raise ValueError("Column is full")
 
+    @staticmethod
+    def legal_moves(board) -> List[int]:
+        """Columns whose top cell is still empty."""
+        return [col for col in range(7) if board[0, col] == 'O']
+
     @staticmethod
     def check_win(board, player) -> bool:
         """Check for a win condition for the given player."""
@@ -75,7 +83,7 @@ class Node:
     """Monte Carlo tree node class."""
 
     def __init__(self, parent: Optional["Node"], board: np.ndarray, player: str, last_move_col: int):
-        self.q = 0  # sum of rollout outcomes
+        self.q = 0  # rollouts won by the player who moved into this node
         self.n = 0  # number of visits
         self.parent = parent
         self.board = board
@@ -87,12 +95,16 @@ class Node:
 
     def check_terminal(self) -> bool:
         """Check whether node is a leaf."""
-        if GameBoard.check_win(self.board, self.player):
+        if GameBoard.check_win(self.board, self.mover()):
             return True
         if GameBoard.check_tie(self.board):
             return True
         return False
 
+    def mover(self) -> str:
+        """Player who made the move leading to this node."""
+        return 'R' if self.player == 'Y' else 'Y'
+
     def add_children(self, children: dict) -> None:
         for child in children.values():
             self.children.append(child)
@@ -104,27 +116,151 @@ class Node:
 
     def undo_move(self) -> None:
         """Undo the last move."""
-        last_row = 0
+        # The last piece played is the highest one in the column
         for row in range(6):
             if self.board[row, self.last_move_col] != 'O':
-                last_row = row
-        self.board[last_row][self.last_move_col] = 'O'
+                self.board[row][self.last_move_col] = 'O'
+                break
         self.player = 'R' if self.player == 'Y' else 'Y'
 
 class ConnectFourAlgorithm:
-    def __init__(self, game: GameBoard, player: str):
+    def __init__(self, game: GameBoard, player: str, max_nodes: Optional[int] = None, max_memory_mb: Optional[float] = None):
         self.game = game
         self.player = player
         self.root = Node(None, game.board.copy(), player, -1)
+        self.max_nodes = max_nodes  # None means no limit on tree size
+        self.max_memory_mb = max_memory_mb  # None means no limit on estimated tree memory
+        self.node_bytes = self.estimate_node_bytes(self.root)
+        self.node_count = 1
+        self.peak_nodes = 1
+        self.column_stats = {}  # col -> (wi, ni) from the most recent search
+
+    @staticmethod
+    def estimate_node_bytes(node: Node) -> int:
+        """Estimate the memory held by one node: the object, its attributes and its board."""
+        return (
+            sys.getsizeof(node)
+            + sys.getsizeof(vars(node))
+            + sys.getsizeof(node.board)
+            + sys.getsizeof(node.children)
+        )
+
+    def node_limit(self) -> Optional[int]:
+        """Most nodes the tree may hold under max_nodes and max_memory_mb."""
+        limits = []
+        if self.max_nodes is not None:
+            limits.append(self.max_nodes)
+        if self.max_memory_mb is not None:
+            limits.append(int(self.max_memory_mb * 1024 * 1024 // self.node_bytes))
+        return min(limits) if limits else None
+
+    def tree_bytes(self, nodes: Optional[int] = None) -> int:
+        """Estimated memory of the tree, or of a tree with the given node count."""
+        return (self.node_count if nodes is None else nodes) * self.node_bytes
+
+    def expand(self, node: Node) -> bool:
+        """Add one child per legal move to node, pruning first if over budget.
+
+        Subtrees are only pruned when that makes room for the new children;
+        otherwise the tree is left as it is and node stays a leaf.
+        """
+        if node.children or node.terminal:
+            return bool(node.children)
+        legal_moves = GameBoard.legal_moves(node.board)
+        limit = self.node_limit()
+        if limit is not None and self.node_count + len(legal_moves) > limit:
+            # Never collapse the path down to the node being expanded
+            path = []
+            ancestor = node
+            while ancestor is not None:
+                path.append(ancestor)
+                ancestor = ancestor.parent
+            # Pruning everything else still leaves the root and the children of the path
+            smallest_tree = 1 + sum(len(ancestor.children) for ancestor in path)
+            if smallest_tree + len(legal_moves) > limit:
+                return False
+            while self.node_count + len(legal_moves) > limit:
+                self.prune(self.root, path)
+
+        children = {}
+        for col in legal_moves:
+            child_game = GameBoard(node.board.copy())
+            child_game.make_move(col, node.player)
+            next_player = 'R' if node.player == 'Y' else 'Y'
+            children[col] = Node(node, child_game.board, next_player, col)
+        node.add_children(children)
+        self.node_count += len(children)
+        self.peak_nodes = max(self.peak_nodes, self.node_count)
+        return bool(node.children)
+
+    def prune(self, node: Node, protected: List[Node] = ()) -> int:
+        """Collapse the least-visited expanded subtree below node.
+
+        The collapsed child keeps its q and n, which already include the
+        outcomes backed up from its descendants, so no statistics are lost.
+        Nodes in protected keep their children. Returns the number of nodes
+        freed.
+        """
+        expanded = [child for child in node.children if child.children]
+        for child in sorted(expanded, key=lambda child: child.n):
+            # Prefer freeing a deeper subtree first so the shallow statistics survive
+            freed = self.prune(child, protected)
+            if freed:
+                return freed
+            if child in protected:
+                continue
+            freed = self.count_nodes(child) - 1
+            child.children = []
+            self.node_count -= freed
+            return freed
+        return 0
+
+    @staticmethod
+    def count_nodes(node: Node) -> int:
+        """Count the nodes in the subtree rooted at node."""
+        return 1 + sum(ConnectFourAlgorithm.count_nodes(child) for child in node.children)
+
+    @staticmethod
+    def backpropagate(node: Optional[Node], winner: Optional[str]) -> None:
+        """Count a rollout for node and its ancestors, crediting the winner's moves."""
+        while node is not None:
+            node.n += 1
+            if winner is not None and node.mover() == winner:
+                node.q += 1
+            node = node.parent
+
+    @staticmethod
+    def select_child(node: Node, exploration_param: float) -> Node:
+        """Pick an unvisited child, otherwise the child with the best UCB1 value."""
+        unvisited = [child for child in node.children if child.n == 0]
+        if unvisited:
+            return random.choice(unvisited)
+        log_n = math.log(node.n)
+        return max(
+            node.children,
+            key=lambda child: child.q / child.n + exploration_param * math.sqrt(log_n / child.n),
+        )
+
+    def simulate(self, node: Node) -> Optional[str]:
+        """Roll out from node and return the winning player, or None for a draw."""
+        mover = node.mover()
+        result = self.rollout(GameBoard(node.board.copy()), mover)
+        if result == 1:
+            return mover
+        if result == -1:
+            return node.player
+        return None
 
     def ur(self):
-        legal_moves = [col for col in range(7) if self.game.board[5][col] == 'O']
+        self.column_stats = {}
+        legal_moves = GameBoard.legal_moves(self.game.board)
         if not legal_moves:
             return None
         return random.choice(legal_moves)
 
     def pmcgs(self, player, simulations, mode):
-        legal_moves = [col for col in range(7) if self.game.board[5][col] == 'O']
+        self.column_stats = {}
+        legal_moves = GameBoard.legal_moves(self.game.board)
         if not legal_moves:
             return None, None
 
@@ -144,6 +280,7 @@ class ConnectFourAlgorithm:
             ni = total_visits
             win_ratio = wi / ni if ni > 0 else 0
             results[col] = {'wi': wi, 'ni': ni, 'win_ratio': win_ratio}
+            self.column_stats[col] = (wi, ni)
 
         if mode == "Verbose":
             for col, result in results.items():
@@ -154,41 +291,44 @@ class ConnectFourAlgorithm:
         return best_move, results
 
 
-    def uct(self, simulations, mode):
-        legal_moves = [col for col in range(7) if self.game.board[5, col] == 'O']
-        if not legal_moves:
-            return None
+    def uct(self, simulations, mode, exploration_param=math.sqrt(2)):
+        """Grow the search tree with UCB1 selection and pick the best column.
 
-        results = {}
-        exploration_param = math.sqrt(2)
+        Runs simulations rollouts per legal column, one at a time, each
+        starting from the leaf reached by following the highest UCB1 value
+        down the tree. The tree only grows while it fits the node and
+        memory budget; past that, rollouts continue from existing leaves.
+        """
+        self.column_stats = {}
+        legal_moves = GameBoard.legal_moves(self.game.board)
+        if not legal_moves or self.root.terminal:
+            return None
+        if not self.expand(self.root):
+            raise ValueError("Search budget is too small to expand the root")
 
-        for col in legal_moves:
-            total_wins = 0
-            total_simulations = 0
-            for _ in range(simulations):
-                new_game = GameBoard(self.game.board.copy())
-                new_game.make_move(col, self.player)
-                result = self.rollout(new_game, self.player)
-                total_simulations += 1
-                if result == 1:  # Player wins
-                    total_wins += 1
+        for _ in range(simulations * len(legal_moves)):
+            node = self.root
+            while node.children:
+                node = self.select_child(node, exploration_param)
+            if not node.terminal and node.n > 0 and self.expand(node):
+                node = random.choice(node.children)
+            self.backpropagate(node, self.simulate(node))
 
-            ni = total_simulations
-            if ni == 0:
+        results = {}
+        for child in self.root.children:
+            col = child.last_move_col
+            self.column_stats[col] = (child.q, child.n)
+            if child.n == 0:
                 ucb_value = float('inf')
             else:
-                wi = total_wins
-                ucb_value = (wi / ni) + exploration_param * math.sqrt(math.log(simulations) / ni)
-
+                ucb_value = child.q / child.n + exploration_param * math.sqrt(math.log(self.root.n) / child.n)
             results[col] = ucb_value
 
             if mode == 'Verbose':
-                print(f"Column {col + 1}: UCB Value: {ucb_value:.2f}")
+                print(f"Column {col + 1}: wi: {child.q}, ni: {child.n}, UCB Value: {ucb_value:.2f}")
 
-        if not results:
-            return None
-
-        best_move = max(results, key=results.get)
+        visited = [child for child in self.root.children if child.n > 0]
+        best_move = max(visited, key=lambda child: child.q / child.n).last_move_col
         if mode == "Verbose":
             print(f"Best move: {best_move + 1}, UCB Value: {results[best_move]:.2f}")
 
@@ -206,6 +346,7 @@ class ConnectFourAlgorithm:
             elif GameBoard.check_tie(game.board):
                 return 0
             current_player = 'R' if current_player == 'Y' else 'Y'
+            game.make_move(random.choice(GameBoard.legal_moves(game.board)), current_player)
             iterations += 1
 
         # If the loop exceeds the maximum iterations, consider it a draw
@@ -225,21 +366,65 @@ def print_board(board):
     for row in board:
         print(" ".join(row))
 
+def board_key(board) -> str:
+    """Flatten a board into a 42 character string, row by row."""
+    return ''.join(''.join(row) for row in board)
+
+def append_game_record(filename, board, player, algorithm, move, column_stats, time_ms, simulations, exploration_param=None):
+    """Append one move to a JSON lines game-record log.
+
+    exploration_param is the UCT constant used for the search, or None for
+    algorithms without one, so records from different settings stay apart.
+    """
+    record = {
+        'b': board_key(board),
+        'p': player,
+        'a': algorithm,
+        'c': exploration_param,
+        'm': move,
+        's': {str(col): list(stats) for col, stats in sorted(column_stats.items())},
+        't': round(time_ms, 3),
+        'n': simulations if column_stats else 0,  # UR runs no simulations
+    }
+    with open(filename, 'a') as file:
+        file.write(json.dumps(record, separators=(',', ':')) + '\n')
+
+def pop_option(args, name):
+    """Remove '--name value' from args and return the value, or None."""
+    if name not in args:
+        return None
+    index = args.index(name)
+    if index + 1 >= len(args):
+        print(f"Missing value for {name}")
+        sys.exit(1)
+    value = args[index + 1]
+    del args[index:index + 2]
+    return value
+
 def main():
-    if len(sys.argv) != 4:
-        print("Usage: python connect_four.py <input_file> <Verbose/Brief/None> <number_of_simulations>")
+    args = sys.argv[1:]
+    max_nodes = pop_option(args, '--max-nodes')
+    max_memory_mb = pop_option(args, '--max-memory-mb')
+    log_file = pop_option(args, '--log')
+    if len(args) != 3:
+        print("Usage: python connect_four.py <input_file> <Verbose/Brief/None> <number_of_simulations> [--max-nodes N] [--max-memory-mb MB] [--log FILE]")
         sys.exit(1)
 
-    filename = sys.argv[1]
-    mode = sys.argv[2]
-    simulations = int(sys.argv[3])
+    filename = args[0]
+    mode = args[1]
+    simulations = int(args[2])
+    max_nodes = int(max_nodes) if max_nodes is not None else None
+    max_memory_mb = float(max_memory_mb) if max_memory_mb is not None else None
 
     algorithm, player, board = read_board(filename)
     print("Algorithm from file:", repr(algorithm))
     game = GameBoard(board)
-    algorithm_obj = ConnectFourAlgorithm(game, player)
+    algorithm_obj = ConnectFourAlgorithm(game, player, max_nodes, max_memory_mb)
     print(player)
     print_board(board)
+    move = None
+    exploration_param = None
+    start = time.perf_counter()
     if algorithm == 'UR':
         move = algorithm_obj.ur()
         print(f"Move selected for UR: {move}")
@@ -251,10 +436,23 @@ def main():
             for col, result in sorted(results.items()):
                 print(f"Column {col + 1}: wi: {result['wi']}, ni: {result['ni']}, Win Ratio: {result['win_ratio']:.2f}")
     elif algorithm == 'UCT':
-        move = algorithm_obj.uct(simulations, mode)
+        exploration_param = math.sqrt(2)
+        try:
+            move = algorithm_obj.uct(simulations, mode, exploration_param)
+        except ValueError as error:
+            print(error)
+            sys.exit(1)
         print(f"Move selected for UCT: {move}")
     else:
         print("Unknown algorithm")
+    time_ms = (time.perf_counter() - start) * 1000
+
+    if log_file is not None and move is not None:
+        append_game_record(log_file, board, player, algorithm, move, algorithm_obj.column_stats,
+                           time_ms, simulations, exploration_param)
+
+    print(f"Tree nodes: {algorithm_obj.node_count} (peak {algorithm_obj.peak_nodes})")
+    print(f"Peak tree memory: {algorithm_obj.tree_bytes(algorithm_obj.peak_nodes) / (1024 * 1024):.3f} MB (estimated)")
 
 if __name__ == "__main__":
     main()
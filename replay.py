@@ -0,0 +1,159 @@
+import sys
+import json
+import heapq
+
+from PA2_RivasSoueidan import pop_option
+
+def read_records(filename):
+    """Yield game records from a JSON lines log one at a time."""
+    with open(filename, 'r') as file:
+        for line in file:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+def position_key(record):
+    """Key a record by algorithm, exploration constant, player and board.
+
+    Searches run with different settings are kept apart so their wi/ni are
+    never summed together.
+    """
+    return record['a'], record.get('c'), record['p'], record['b']
+
+def push_bounded(heap, limit, item):
+    """Keep only the limit largest items in a min-heap."""
+    if limit <= 0:
+        return
+    if len(heap) < limit:
+        heapq.heappush(heap, item)
+    elif item > heap[0]:
+        heapq.heapreplace(heap, item)
+
+def count_hot(counters, limit, key, record):
+    """Track frequent positions with the Misra-Gries summary.
+
+    At most limit positions are held at once, each with a count, the
+    summed per-column wi/ni seen for it and how often each column was
+    played, so memory stays bounded however long the log is.
+    """
+    if key not in counters and len(counters) >= limit:
+        for other in list(counters):
+            counters[other]['count'] -= 1
+            if counters[other]['count'] == 0:
+                del counters[other]
+        return
+    entry = counters.setdefault(key, {'count': 0, 'stats': {}, 'moves': {}})
+    entry['count'] += 1
+    entry['moves'][record['m']] = entry['moves'].get(record['m'], 0) + 1
+    for col, (wi, ni) in record['s'].items():
+        totals = entry['stats'].setdefault(int(col), [0, 0])
+        totals[0] += wi
+        totals[1] += ni
+
+def best_column(stats):
+    """Pick the column with the highest combined wi / ni ratio."""
+    played = {col: wi / ni for col, (wi, ni) in stats.items() if ni > 0}
+    if not played:
+        return None
+    return max(played, key=played.get)
+
+def judge_move(entry, move, margin):
+    """Compare a played column with the earlier searches of its position.
+
+    A single record always picks its own best wi / ni, so the move is judged
+    against the wi / ni summed over previous records of the same position
+    instead. Returns (loss, best_col) when the move falls more than margin
+    below the best column, otherwise None.
+    """
+    best_col = best_column(entry['stats'])
+    wi, ni = entry['stats'].get(move, (0, 0))
+    if best_col is None or ni == 0:
+        return None
+    best_wi, best_ni = entry['stats'][best_col]
+    loss = best_wi / best_ni - wi / ni
+    if loss > margin:
+        return loss, best_col
+    return None
+
+def analyse(filename, top, margin, hot_limit):
+    """Stream through a log and collect slow moves, blunders and hot positions.
+
+    Blunders can only be found for positions that are still in the hot
+    position cache when they are seen again; positions seen once, or
+    evicted before they recur, have no earlier evidence to judge against.
+    """
+    slowest = []
+    blunders = []
+    counters = {}
+    moves = 0
+
+    for index, record in enumerate(read_records(filename)):
+        moves += 1
+        push_bounded(slowest, top, (record['t'], index, record['b'], record['p'], record['m']))
+
+        key = position_key(record)
+        if key in counters:
+            judged = judge_move(counters[key], record['m'], margin)
+            if judged is not None:
+                loss, best_col = judged
+                push_bounded(blunders, top, (loss, index, record['b'], record['p'], record['m'], best_col))
+
+        count_hot(counters, hot_limit, key, record)
+
+    return moves, sorted(slowest, reverse=True), sorted(blunders, reverse=True), counters
+
+def write_book(filename, counters, min_count):
+    """Write hot positions and their best column as JSON lines."""
+    written = 0
+    with open(filename, 'w') as file:
+        for (algorithm, exploration_param, player, board), entry in sorted(
+            counters.items(), key=lambda item: -item[1]['count']
+        ):
+            move = best_column(entry['stats'])
+            if entry['count'] < min_count or move is None:
+                continue
+            record = {'b': board, 'p': player, 'a': algorithm, 'c': exploration_param, 'm': move, 'k': entry['count']}
+            file.write(json.dumps(record, separators=(',', ':')) + '\n')
+            written += 1
+    return written
+
+def main():
+    args = sys.argv[1:]
+    top = pop_option(args, '--top')
+    margin = pop_option(args, '--margin')
+    hot_limit = pop_option(args, '--hot')
+    book_file = pop_option(args, '--book')
+    min_count = pop_option(args, '--min-count')
+    if len(args) != 1:
+        print("Usage: python replay.py <log_file> [--top N] [--margin R] [--hot N] [--book FILE] [--min-count N]")
+        sys.exit(1)
+
+    top = int(top) if top is not None else 10
+    margin = float(margin) if margin is not None else 0.1
+    hot_limit = int(hot_limit) if hot_limit is not None else 100
+    min_count = int(min_count) if min_count is not None else 2
+
+    moves, slowest, blunders, counters = analyse(args[0], top, margin, hot_limit)
+    print(f"Moves read: {moves}")
+
+    print("Slowest positions:")
+    for time_ms, index, board, player, move in slowest:
+        print(f"Move {index}: {time_ms:.2f} ms, player {player}, column {move + 1}, board {board}")
+
+    print(f"Blunders (only positions repeated while in the {hot_limit}-position hot cache can be judged):")
+    for loss, index, board, player, move, best_col in blunders:
+        print(f"Move {index}: played column {move + 1}, best column {best_col + 1}, win ratio lost {loss:.2f}, board {board}")
+
+    print("Hot positions:")
+    for (algorithm, exploration_param, player, board), entry in sorted(
+        counters.items(), key=lambda item: -item[1]['count']
+    )[:top]:
+        setting = f", c={exploration_param:.2f}" if exploration_param is not None else ""
+        print(f"Seen {entry['count']} times: {algorithm}{setting}, player {player}, board {board}")
+
+    if book_file is not None:
+        written = write_book(book_file, counters, min_count)
+        print(f"Wrote {written} positions to {book_file}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+import sys
+import time
+import random
+import math
+from multiprocessing import Pool
+
+from PA2_RivasSoueidan import GameBoard, ConnectFourAlgorithm, read_board, pop_option, append_game_record
+
+def parse_grid(value, cast, default):
+    """Parse a comma separated option value into a list of cast values."""
+    if value is None:
+        return default
+    return [cast(item) for item in value.split(',') if item]
+
+def percentile(values, pct):
+    """Return the pct-th percentile of values using nearest rank."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+def play_game(job):
+    """Play a candidate UCT configuration against the reference UCT from a corpus position.
+
+    The candidate moves first from the position in even-seeded games and
+    second in odd-seeded ones. Returns the outcome for the candidate (1 win,
+    0 draw, -1 loss), the wall-clock and CPU time in seconds it spent on
+    each of its moves and a game record for each of those moves.
+    """
+    board, player, candidate, reference, seed = job
+    random.seed(seed)
+    game = GameBoard(board)
+    current = player
+    candidate_player = player if seed % 2 == 0 else ('R' if player == 'Y' else 'Y')
+    latencies = []
+    cpu_times = []
+    records = []
+
+    for _ in range(42):
+        algorithm_obj = ConnectFourAlgorithm(game, current)
+        if current == candidate_player:
+            exploration_param, simulations = candidate
+            start = time.perf_counter()
+            cpu_start = time.process_time()
+            move = algorithm_obj.uct(simulations, 'None', exploration_param)
+            cpu_times.append(time.process_time() - cpu_start)
+            latencies.append(time.perf_counter() - start)
+            if move is not None:
+                records.append((game.board.tolist(), current, move, algorithm_obj.column_stats, latencies[-1] * 1000))
+        else:
+            exploration_param, simulations = reference
+            move = algorithm_obj.uct(simulations, 'None', exploration_param)
+        if move is None:
+            return 0, latencies, cpu_times, records
+        game.make_move(move, current)
+        if GameBoard.check_win(game.board, current):
+            return (1 if current == candidate_player else -1), latencies, cpu_times, records
+        if GameBoard.check_tie(game.board):
+            return 0, latencies, cpu_times, records
+        current = 'R' if current == 'Y' else 'Y'
+
+    return 0, latencies, cpu_times, records
+
+def run_config(corpus, exploration_param, simulations, workers, games, reference, pool=None, log_file=None):
+    """Play games from every corpus position and summarise strength and cost.
+
+    pool is an already started worker pool, so only the games are timed.
+    """
+    jobs = []
+    for board, player in corpus:
+        for seed in range(games):
+            jobs.append((board, player, (exploration_param, simulations), reference, seed))
+
+    start = time.perf_counter()
+    if pool is not None:
+        outcomes = pool.map(play_game, jobs)
+    else:
+        outcomes = [play_game(job) for job in jobs]
+    elapsed = time.perf_counter() - start
+
+    if log_file is not None:
+        for _, _, _, records in outcomes:
+            for board, player, move, column_stats, time_ms in records:
+                append_game_record(log_file, board, player, 'UCT', move, column_stats, time_ms,
+                                   simulations, exploration_param)
+
+    wins = sum(1 for result, _, _, _ in outcomes if result == 1)
+    draws = sum(1 for result, _, _, _ in outcomes if result == 0)
+    latencies = [latency for _, game_latencies, _, _ in outcomes for latency in game_latencies]
+    cpu_times = [cpu_time for _, _, game_cpu_times, _ in outcomes for cpu_time in game_cpu_times]
+    return {
+        'c': exploration_param,
+        'simulations': simulations,
+        'workers': workers,
+        'games': len(jobs),
+        'win_rate': wins / len(jobs) if jobs else 0,
+        'draw_rate': draws / len(jobs) if jobs else 0,
+        'moves_per_sec': len(latencies) / elapsed if elapsed > 0 else 0,
+        'cpu_ms': sum(cpu_times) / len(cpu_times) * 1000 if cpu_times else 0,
+        'p99_ms': percentile(latencies, 99) * 1000,
+    }
+
+def print_table(rows):
+    print(f"{'c':>6} {'sims':>6} {'workers':>7} {'games':>6} {'win rate':>8} {'draws':>6} {'moves/s':>9} {'cpu ms':>9} {'p99 ms':>9}")
+    for row in rows:
+        print(f"{row['c']:>6.2f} {row['simulations']:>6} {row['workers']:>7} {row['games']:>6} "
+              f"{row['win_rate']:>8.2f} {row['draw_rate']:>6.2f} {row['moves_per_sec']:>9.1f} "
+              f"{row['cpu_ms']:>9.2f} {row['p99_ms']:>9.2f}")
+
+def main():
+    args = sys.argv[1:]
+    exploration_params = parse_grid(pop_option(args, '--c'), float, [math.sqrt(2)])
+    simulation_budgets = parse_grid(pop_option(args, '--sims'), int, [10, 50, 100])
+    worker_counts = parse_grid(pop_option(args, '--workers'), int, [1])
+    games = pop_option(args, '--games')
+    reference_c = pop_option(args, '--ref-c')
+    reference_sims = pop_option(args, '--ref-sims')
+    min_win_rate = pop_option(args, '--min-win-rate')
+    log_file = pop_option(args, '--log')
+    if not args:
+        print("Usage: python sweep.py <board_file>... [--c 0.5,1.41] [--sims 10,50] [--workers 1,4] [--games N] "
+              "[--ref-c C] [--ref-sims N] [--min-win-rate R] [--log FILE]")
+        sys.exit(1)
+
+    games = int(games) if games is not None else 10
+    reference = (
+        float(reference_c) if reference_c is not None else math.sqrt(2),
+        int(reference_sims) if reference_sims is not None else 50,
+    )
+
+    corpus = []
+    for filename in args:
+        _, player, board = read_board(filename)
+        corpus.append((board, player))
+
+    # Start each pool once up front so its startup is not charged to a configuration
+    pools = {workers: Pool(workers) for workers in set(worker_counts) if workers > 1}
+    rows = []
+    try:
+        for exploration_param in exploration_params:
+            for simulations in simulation_budgets:
+                for workers in worker_counts:
+                    rows.append(run_config(corpus, exploration_param, simulations, workers, games,
+                                           reference, pools.get(workers), log_file))
+    finally:
+        for pool in pools.values():
+            pool.close()
+            pool.join()
+
+    print(f"Reference: c={reference[0]:.2f}, simulations={reference[1]}")
+    print_table(rows)
+
+    if min_win_rate is not None:
+        passing = [row for row in rows if row['win_rate'] >= float(min_win_rate)]
+        if not passing:
+            print(f"No configuration reaches a win rate of {float(min_win_rate):.2f}")
+            return
+        # Workers only add throughput, so rank by search CPU per move first
+        best = min(passing, key=lambda row: (row['cpu_ms'], -row['moves_per_sec']))
+        print(f"Cheapest configuration: c={best['c']:.2f}, simulations={best['simulations']}, workers={best['workers']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+from PA2_RivasSoueidan import GameBoard, Node, ConnectFourAlgorithm
+
+def empty_board():
+    return [['O'] * 7 for _ in range(6)]
+
+def has_floating_pieces(board):
+    """Check for an empty cell below a piece in any column."""
+    for col in range(7):
+        for row in range(5):
+            if board[row, col] != 'O' and board[row + 1, col] == 'O':
+                return True
+    return False
+
+def test_make_move_stacks_from_the_bottom_row():
+    game = GameBoard(empty_board())
+    game.make_move(3, 'R')
+    game.make_move(3, 'Y')
+    assert game.board[5, 3] == 'R'
+    assert game.board[4, 3] == 'Y'
+    assert game.board[3, 3] == 'O'
+
+def test_make_move_rejects_full_column():
+    game = GameBoard(empty_board())
+    for turn in range(6):
+        game.make_move(0, 'R' if turn % 2 else 'Y')
+    with pytest.raises(ValueError):
+        game.make_move(0, 'R')
+
+def test_legal_moves_skip_full_columns():
+    game = GameBoard(empty_board())
+    assert GameBoard.legal_moves(game.board) == list(range(7))
+    for turn in range(6):
+        game.make_move(2, 'R' if turn % 2 else 'Y')
+    assert GameBoard.legal_moves(game.board) == [0, 1, 3, 4, 5, 6]
+
+def test_undo_move_removes_last_piece_played():
+    game = GameBoard(empty_board())
+    game.make_move(4, 'R')
+    game.make_move(4, 'Y')
+    node = Node(None, game.board, 'R', 4)
+    node.undo_move()
+    assert node.board[5, 4] == 'R'
+    assert node.board[4, 4] == 'O'
+    assert node.player == 'Y'
+
+def test_rollout_scores_a_finished_game():
+    game = GameBoard(empty_board())
+    for col in range(4):
+        game.make_move(col, 'R')
+    algorithm_obj = ConnectFourAlgorithm(GameBoard(empty_board()), 'Y')
+    assert algorithm_obj.rollout(game, 'R') == 1
+    assert algorithm_obj.rollout(game, 'Y') == -1
+
+def test_rollout_plays_legal_moves_to_the_end():
+    random.seed(0)
+    algorithm_obj = ConnectFourAlgorithm(GameBoard(empty_board()), 'R')
+    for _ in range(20):
+        game = GameBoard(empty_board())
+        result = algorithm_obj.rollout(game, 'Y')
+        assert result in (1, 0, -1)
+        assert not has_floating_pieces(game.board)
+        finished = GameBoard.check_win(game.board, 'R') or GameBoard.check_win(game.board, 'Y')
+        assert finished or GameBoard.check_tie(game.board)
@@ -0,0 +1,80 @@
+import json
+
+from PA2_RivasSoueidan import GameBoard, ConnectFourAlgorithm, append_game_record
+from replay import analyse, count_hot, write_book
+
+def empty_board():
+    return [['O'] * 7 for _ in range(6)]
+
+def make_record(board, move, stats, c=1.0, time_ms=1.0):
+    return {'b': board, 'p': 'R', 'a': 'UCT', 'c': c, 'm': move, 's': stats, 't': time_ms, 'n': 4}
+
+def write_log(path, records):
+    with open(path, 'w') as file:
+        for record in records:
+            file.write(json.dumps(record) + '\n')
+
+def test_append_game_record_writes_one_compact_line(tmp_path):
+    log = tmp_path / 'games.log'
+    append_game_record(log, empty_board(), 'R', 'UCT', 3, {3: (2, 4), 0: (1, 3)}, 12.34567, 4, 0.5)
+    append_game_record(log, empty_board(), 'Y', 'UR', 1, {}, 0.1, 4)
+
+    lines = log.read_text().splitlines()
+    assert len(lines) == 2
+    assert ' ' not in lines[0]
+    first, second = (json.loads(line) for line in lines)
+    assert first == {'b': 'O' * 42, 'p': 'R', 'a': 'UCT', 'c': 0.5, 'm': 3,
+                     's': {'0': [1, 3], '3': [2, 4]}, 't': 12.346, 'n': 4}
+    assert second['c'] is None
+    assert second['n'] == 0
+
+def test_column_stats_reset_between_searches():
+    algorithm_obj = ConnectFourAlgorithm(GameBoard(empty_board()), 'R')
+    algorithm_obj.pmcgs('R', 1, 'None')
+    assert len(algorithm_obj.column_stats) == 7
+    algorithm_obj.ur()
+    assert algorithm_obj.column_stats == {}
+
+def test_count_hot_evicts_with_misra_gries_decrements():
+    counters = {}
+    for key in ['a', 'a', 'b', 'c']:
+        count_hot(counters, 2, key, make_record(key, 0, {'0': [1, 2]}))
+    # 'c' arrives with the summary full, so every count drops by one
+    assert counters == {'a': {'count': 1, 'stats': {0: [2, 4]}, 'moves': {0: 2}}}
+
+def test_analyse_flags_move_worse_than_earlier_searches(tmp_path):
+    log = tmp_path / 'games.log'
+    write_log(log, [
+        make_record('x', 0, {'0': [8, 10], '1': [1, 10]}),
+        make_record('x', 1, {'0': [1, 2], '1': [2, 2]}),
+        make_record('y', 1, {'0': [0, 2], '1': [2, 2]}),
+    ])
+    moves, _, blunders, _ = analyse(log, 5, 0.1, 10)
+    assert moves == 3
+    assert len(blunders) == 1
+    loss, index, board, _, move, best_col = blunders[0]
+    assert (index, board, move, best_col) == (1, 'x', 1, 0)
+    assert round(loss, 2) == 0.7
+
+def test_analyse_keeps_exploration_constants_apart(tmp_path):
+    log = tmp_path / 'games.log'
+    write_log(log, [
+        make_record('x', 0, {'0': [8, 10], '1': [1, 10]}, c=0.5),
+        make_record('x', 1, {'0': [1, 2], '1': [2, 2]}, c=2.0),
+    ])
+    _, _, blunders, counters = analyse(log, 5, 0.1, 10)
+    assert blunders == []
+    assert len(counters) == 2
+
+def test_write_book_keeps_frequent_positions(tmp_path):
+    log = tmp_path / 'games.log'
+    write_log(log, [
+        make_record('x', 0, {'0': [1, 4], '1': [3, 4]}),
+        make_record('x', 1, {'0': [1, 4], '1': [3, 4]}),
+        make_record('y', 0, {'0': [4, 4]}),
+    ])
+    _, _, _, counters = analyse(log, 5, 0.1, 10)
+    book = tmp_path / 'book.jsonl'
+    assert write_book(book, counters, 2) == 1
+    entries = [json.loads(line) for line in book.read_text().splitlines()]
+    assert entries == [{'b': 'x', 'p': 'R', 'a': 'UCT', 'c': 1.0, 'm': 1, 'k': 2}]
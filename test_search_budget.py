@@ -0,0 +1,62 @@
+import pytest
+
+from PA2_RivasSoueidan import GameBoard, ConnectFourAlgorithm
+
+def empty_board():
+    return [['O'] * 7 for _ in range(6)]
+
+def test_expand_prunes_least_visited_subtree_past_budget():
+    algorithm_obj = ConnectFourAlgorithm(GameBoard(empty_board()), 'R')
+    assert algorithm_obj.expand(algorithm_obj.root)
+    busy, quiet = algorithm_obj.root.children[0], algorithm_obj.root.children[1]
+    busy.q, busy.n = 3, 5
+    quiet.q, quiet.n = 1, 2
+    assert algorithm_obj.expand(busy)
+    assert algorithm_obj.expand(quiet)
+    algorithm_obj.max_nodes = algorithm_obj.node_count + 1
+
+    # A third level only fits once the least-visited subtree is collapsed
+    grandchild = busy.children[0]
+    assert algorithm_obj.expand(grandchild)
+    assert quiet.children == []
+    assert (quiet.q, quiet.n) == (1, 2)
+    assert grandchild.children
+    assert algorithm_obj.node_count <= algorithm_obj.max_nodes
+    assert algorithm_obj.node_count == algorithm_obj.count_nodes(algorithm_obj.root)
+
+def test_expand_leaves_tree_alone_when_pruning_cannot_make_room():
+    algorithm_obj = ConnectFourAlgorithm(GameBoard(empty_board()), 'R')
+    algorithm_obj.expand(algorithm_obj.root)
+    child = algorithm_obj.root.children[0]
+    algorithm_obj.expand(child)
+    algorithm_obj.max_nodes = algorithm_obj.node_count
+    nodes = algorithm_obj.node_count
+
+    assert not algorithm_obj.expand(child.children[0])
+    assert child.children
+    assert algorithm_obj.node_count == nodes
+
+def test_uct_tree_stays_within_node_budget():
+    unbounded = ConnectFourAlgorithm(GameBoard(empty_board()), 'R')
+    unbounded.uct(10, 'None')
+    assert unbounded.node_count > 40
+
+    bounded = ConnectFourAlgorithm(GameBoard(empty_board()), 'R', max_nodes=40)
+    assert bounded.uct(10, 'None') is not None
+    assert bounded.peak_nodes <= 40
+    assert bounded.node_count == bounded.count_nodes(bounded.root)
+    assert bounded.root.n == 70
+
+def test_uct_tree_stays_within_memory_budget():
+    probe = ConnectFourAlgorithm(GameBoard(empty_board()), 'R')
+    max_memory_mb = 40 * probe.node_bytes / (1024 * 1024)
+
+    bounded = ConnectFourAlgorithm(GameBoard(empty_board()), 'R', max_memory_mb=max_memory_mb)
+    assert bounded.uct(10, 'None') is not None
+    assert bounded.peak_nodes <= 40
+    assert bounded.tree_bytes(bounded.peak_nodes) <= max_memory_mb * 1024 * 1024
+
+def test_uct_rejects_budget_smaller_than_root():
+    algorithm_obj = ConnectFourAlgorithm(GameBoard(empty_board()), 'R', max_nodes=5)
+    with pytest.raises(ValueError):
+        algorithm_obj.uct(10, 'None')